@@ -26,12 +26,6 @@ class PipelinesApi(ApiContainer):
 
         return pipelines
 
-    # def list_events_by_id(self):
-    #     return self.__client.execute_get_json(f"{self.base_uri}/{pipeline_id}/events")
-
-    # def list_events_by_id(self):
-    #     return self.__client.execute_get_json(f"{self.base_uri}/{pipeline_id}/events")
-
     def get_by_id(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
         return self.__client.api("GET", f"{self.base_uri}/{pipeline_id}", _expected=(200, 404))
 
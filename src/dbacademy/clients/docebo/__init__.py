@@ -1,5 +1,10 @@
 __all__ = ["DoceboRestClient", "from_args", "from_environment", "from_workspace"]
 
+import time
+import hashlib
+import requests
+from typing import Dict, Tuple
+from functools import cached_property
 from dbacademy.clients.rest.common import ApiClient
 from dbacademy.clients import ClientErrorHandler
 from dbacademy.clients.docebo.manage_api import ManageAPI
@@ -9,10 +14,16 @@ from dbacademy.clients.docebo.sessions_api import SessionsAPI
 
 DEFAULT_SCOPE = "DOCEBO"
 
+# Shared across all clients so that re-authenticating reuses the TLS connection to the Docebo endpoint.
+_AUTH_SESSION = requests.Session()
+
 
 class DoceboRestClient(ApiClient):
     """Docebo REST API client."""
 
+    # Maps (endpoint, consumer_key, username, credentials_digest) to (access_token, expires_at).
+    _token_cache: Dict[Tuple[str, str, str, str], Tuple[str, float]] = dict()
+
     def __init__(self,
                  *,
                  endpoint: str,
@@ -39,19 +50,19 @@ class DoceboRestClient(ApiClient):
                          throttle_seconds=validate(throttle_seconds=throttle_seconds).required.int(),
                          error_handler=validate(error_handler=error_handler).required.as_type(ClientErrorHandler))
 
-    @property
+    @cached_property
     def manage(self) -> ManageAPI:
         return ManageAPI(self)
 
-    @property
+    @cached_property
     def courses(self) -> CoursesAPI:
         return CoursesAPI(self)
 
-    @property
+    @cached_property
     def events(self) -> EventsAPI:
         return EventsAPI(self)
 
-    @property
+    @cached_property
     def sessions(self) -> SessionsAPI:
         return SessionsAPI(self)
 
@@ -60,8 +71,23 @@ class DoceboRestClient(ApiClient):
         return self.__error_handler
 
     @staticmethod
-    def authenticate(*, endpoint: str, consumer_key: str, consumer_secret: str, username: str, password: str) -> str:
-        import requests
+    def authenticate(*, endpoint: str, consumer_key: str, consumer_secret: str, username: str, password: str, force: bool = False) -> str:
+        """
+        Requests an OAuth access token, reusing a previously issued token until it is within 60 seconds of expiring.
+
+        Args:
+            force: Discard any cached token and request a new one, e.g. after the cached token was revoked.
+        """
+        # The secrets are part of the key, so wrong credentials never match a cached token, but only as a digest.
+        credentials_digest = hashlib.sha256(f"{consumer_secret}\0{password}".encode()).hexdigest()
+        cache_key = (endpoint, consumer_key, username, credentials_digest)
+
+        if force:
+            DoceboRestClient._token_cache.pop(cache_key, None)
+
+        cached = DoceboRestClient._token_cache.get(cache_key)
+        if cached is not None and time.time() < cached[1] - 60:
+            return cached[0]
 
         # Format the Payload
         payload = {
@@ -74,10 +100,15 @@ class DoceboRestClient(ApiClient):
 
         # Request an OAuth Token
         url = f"{endpoint}/oauth2/token"
-        response = requests.post(url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        now = time.time()
+        response = _AUTH_SESSION.post(url, data=payload, headers={"Content-Type": "application/x-www-form-urlencoded"})
         assert response.status_code == 200, f"Expected the HTTP status code 200, found {response.status_code}: {response.text}"
 
-        return response.json().get("access_token")
+        results = response.json()
+        access_token = results.get("access_token")
+        DoceboRestClient._token_cache[cache_key] = (access_token, now + results.get("expires_in", 0))
+
+        return access_token
 
 
 def from_args(*,
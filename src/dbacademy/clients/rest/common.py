@@ -4,16 +4,54 @@ __all__ = ["ApiContainer", "ApiClient", "DatabricksApiException",
            "HttpStatusCodes", "HttpMethod", "HttpReturnType", "IfNotExists", "IfExists",
            "Item", "ItemId", "ItemOrId"]
 
+import json
+import math
+import time
+import base64
+import random
+import inspect
 import requests
 from pprint import pformat
+from functools import cached_property
+from urllib.parse import urljoin, urlparse
+from socket import gethostbyname, gaierror
 from dbacademy.common import validate
+from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 from dbacademy.clients import ClientErrorHandler
-from typing import Any, Container, Dict, Type, TypeVar, Union, Literal
+from typing import Any, Callable, Container, Dict, IO, List, Set, Type, TypeVar, Union, Literal, get_type_hints
+
+try:
+    # Optional: orjson serializes several times faster than the stdlib and produces bytes directly.
+    import orjson
+
+    def _json_dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    def _json_loads(content: bytes) -> Any:
+        return orjson.loads(content)
+
+except ImportError:
+    orjson = None
+
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    def _json_loads(content: bytes) -> Any:
+        return json.loads(content)  # Accepts bytes directly, skipping requests' charset detection
+
+# Headers applied to every session, on top of requests' own defaults.
+_SESSION_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+# Members never listed by ApiContainer.help(); "client" is the back-reference to the owning client, not a nested API.
+_HELP_EXCLUDED_MEMBERS = ["T", "_help_cache", "client"]
+
+# Payloads are serialized by api() itself, so the content type must accompany them.
+_JSON_REQUEST_HEADERS = {"Content-Type": "application/json"}
 
 HttpStatusCodes = Union[int, Container[int]]
 HttpMethod = Literal["GET", "PUT", "POST", "DELETE", "PATCH", "HEAD", "OPTIONS"]
-HttpReturnType = TypeVar("HttpReturnType", bound=Union[dict, str, bytes, requests.Response, None])
+HttpReturnType = TypeVar("HttpReturnType", bound=Union[dict, str, bytes, IO, requests.Response, None])
 
 IfNotExists = Literal["error", "ignore"]
 IfExists = Literal["create", "error", "ignore", "overwrite", "update"]
@@ -23,6 +61,16 @@ ItemId = Union[int, str]
 ItemOrId = Union[int, str, Dict]
 
 
+class _JitteredRetry(Retry):
+    """
+    Applies "full jitter" to urllib3's exponential backoff, sleeping random() * min(backoff_factor * 2^n, backoff_max),
+    so that concurrent callers don't retry in lock-step.  Works with urllib3 < 2, which lacks backoff_jitter.
+    """
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
 class ApiContainer(object):
 
     T = TypeVar('T')
@@ -32,19 +80,51 @@ class ApiContainer(object):
         return self
     pass
 
+    # Printable member names for each ApiContainer subclass, computed on the first call to help().
+    _help_cache: Dict[type, List[str]] = dict()
+
     def help(self):
-        for member_name in dir(self):
-            
-            if member_name.startswith("__") or member_name in ["T"]:
-                continue
-            
-            member = getattr(self, member_name)
-
-            if isinstance(member, ApiContainer):
+        """
+        Prints the nested APIs and the methods of this container.
+        Members are discovered from the class without invoking any properties, so listing them has no side effects.
+        """
+        member_names = ApiContainer._help_cache.get(type(self))
+
+        if member_names is None:
+            member_names = list()
+
+            for member_name in dir(type(self)):
+                if member_name.startswith("__") or member_name in _HELP_EXCLUDED_MEMBERS:
+                    continue
+
+                member = inspect.getattr_static(type(self), member_name)
+
+                if isinstance(member, (property, cached_property)):
+                    fget = member.fget if isinstance(member, property) else member.func
+                    if _returns_container(fget):
+                        member_names.append(f"{member_name}")
+
+                elif isinstance(member, (staticmethod, classmethod)) or callable(member):
+                    member_names.append(f"{member_name}()")
+
+            ApiContainer._help_cache[type(self)] = member_names
+
+        # Nested APIs assigned as instance attributes can vary per instance, so they are not cached.
+        for member_name, member in vars(self).items():
+            if isinstance(member, ApiContainer) and not member_name.startswith("_") and member_name not in _HELP_EXCLUDED_MEMBERS:
                 print(f"{member_name}")
 
-            if callable(member):
-                print(f"{member_name}()")
+        for member_name in member_names:
+            print(member_name)
+
+
+def _returns_container(fget: Callable) -> bool:
+    try:
+        return_type = get_type_hints(fget).get("return")
+    except Exception:
+        return False  # Unresolvable annotations, e.g. forward references to modules that were never imported.
+
+    return isinstance(return_type, type) and issubclass(return_type, ApiContainer)
 
 
 class ApiClient(ApiContainer):
@@ -53,6 +133,9 @@ class ApiClient(ApiContainer):
     dns_retry: bool = False
     trace: bool = False
 
+    # Hostnames that have already passed _verify_hostname(), shared by all clients.
+    _verified_hostnames: Set[str] = set()
+
     def __init__(self,
                  endpoint: str,
                  *,
@@ -63,7 +146,8 @@ class ApiClient(ApiContainer):
                  client: ApiClient = None,
                  throttle_seconds: int = 0,
                  verbose: bool = False,
-                 error_handler: ClientErrorHandler = ClientErrorHandler()):
+                 error_handler: ClientErrorHandler = ClientErrorHandler(),
+                 pool_maxsize: int = 32):
         """
         Create a Databricks REST API client.
 
@@ -74,11 +158,13 @@ class ApiClient(ApiContainer):
             password: The authentication password.  Defaults to None.
             authorization_header: The header to use for authentication.
                 By default, it's generated from the token or password.
-            client: A parent ApiClient from which to clone settings.
+            client: A parent ApiClient from which to clone settings.  Its connection pool is shared, but this client
+                gets its own session, so headers set on one client do not affect the other.
             throttle_seconds: Number of seconds to sleep between requests.
+            pool_maxsize: Number of connections kept alive per host; raise for heavily multi-threaded callers.
+                Ignored when a parent client is specified, in which case the parent's pool and size are used.
         """
         super().__init__()
-        import requests, base64
 
         self.__verbose = validate(verbose=verbose).required.bool()
 
@@ -88,6 +174,10 @@ class ApiClient(ApiContainer):
             # We have a client, and we don't have an absolute endpoint, combine them.
             self.__endpoint = client.endpoint.lstrip("/") + "/" + self.__endpoint
 
+        # Parsed once here rather than on every call to api()
+        self.__hostname = urlparse(self.__endpoint).hostname
+        self.__endpoint_prefix = self.__endpoint + "/"
+
         # The remaining parameters are all conditional depending on what was first provided.
         self.__token = validate(token=token).optional.str()
         self.__username = validate(username=username).optional.str()
@@ -108,38 +198,39 @@ class ApiClient(ApiContainer):
 
         self.__throttle_seconds = validate(throttle_seconds=throttle_seconds).required.int()
         self.__error_handler = validate(error_handler=error_handler).required.as_type(ClientErrorHandler)
+        self.__pool_maxsize = validate(pool_maxsize=pool_maxsize).required.int()
 
         self.__read_timeout = 300   # seconds
         self.__connect_timeout = 5  # seconds
         self.__max_retries = 25
-        self.__last_request_timestamp = 0  # No property for this one.
-
-        # Reference information for this backoff/retry issues
-        # https://stackoverflow.com/questions/47675138/how-to-override-backoff-max-while-working-with-requests-retry
-
-        # backoff_factor = self.connect_timeout                            # Default is 5
-
-        # noinspection PyUnresolvedReferences
-        # BACKOFF_MAX is not a real parameter but the documented parameter advertised DEFAULT_BACKOFF_MAX doesn't actually exist.
-        # connection_retries = Retry.BACKOFF_MAX / backoff_factor  # Should be 24
-
-        # retry = Retry(connect=connection_retries,                # Retry Connect errors N times
-        #               backoff_factor=backoff_factor,             # A backoff factor to apply between attempts after the second try
-        #               total=connection_retries,                  # Overrides all other retry counts
-        #               allowed_methods=["GET", "DELETE", "PUT"],  # Only retry for idempotent http-verbs
-        #               status=connection_retries,                 # Retry for status_forcelist errors N times
-        #               status_forcelist=[429])                    # list of codes to force a retry for
-        #
-        # retry = Retry(connect=connection_retries, backoff_factor=backoff_factor, status=connection_retries)
-
-        # retry = Retry(connect=connection_retries,
-        #               backoff_factor=backoff_factor)
+        self.__last_request_timestamp = -math.inf  # No property for this one; -inf so the first call never sleeps.
 
         self.__session = requests.Session()
-        self.session.headers = {'Authorization': self.authorization_header, 'Content-Type': 'text/json'}
-        
-        self.__http_adapter = HTTPAdapter()
-        # self.http_adapter = HTTPAdapter(max_retries=retry)
+        # Update rather than replace requests' default headers, and always advertise compression so large list
+        # responses are sent gzipped even when callers customize the session's headers.
+        self.session.headers.update(_SESSION_HEADERS)
+        self.session.headers['Authorization'] = self.authorization_header
+
+        if client is not None:
+            # Share the parent's adapter, and with it urllib3's connection pool, while keeping this client's session and
+            # headers separate so that changes to one client's headers never leak into its parent or siblings.
+            self.__pool_maxsize = client.pool_maxsize
+            self.__http_adapter = client.http_adapter
+        else:
+            # Reference information for this backoff/retry issues
+            # https://stackoverflow.com/questions/47675138/how-to-override-backoff-max-while-working-with-requests-retry
+            # 429s and rate-limited 500s are retried by api() itself, so the adapter only handles transport-level failures.
+            retry = _JitteredRetry(total=5,
+                                   connect=3,                                  # Retry connect errors N times
+                                   read=False,                                 # Raise read errors as-is, api() retries them once
+                                   status=3,                                   # Retry for status_forcelist errors N times
+                                   backoff_factor=0.25,                        # 0.25s, 0.5s, 1s... before jitter is applied
+                                   status_forcelist=(502, 503, 504),           # Gateway errors are transient
+                                   allowed_methods=frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"]),  # Only idempotent http-verbs
+                                   respect_retry_after_header=True,
+                                   raise_on_status=False)                      # Hand the final response back to api()
+
+            self.__http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=self.pool_maxsize, pool_block=False, max_retries=retry)
 
         # noinspection HttpUrlsUsage
         self.session.mount('http://', self.http_adapter)
@@ -161,6 +252,10 @@ class ApiClient(ApiContainer):
     def max_retries(self) -> int:
         return self.__max_retries
 
+    @property
+    def pool_maxsize(self) -> int:
+        return self.__pool_maxsize
+
     @property
     def http_adapter(self) -> HTTPAdapter:
         return self.__http_adapter
@@ -227,6 +322,8 @@ class ApiClient(ApiContainer):
                str: Return the body as a text str.
                dict: Parse the body as json and return a dict.
                bytes: Return the body as binary data.
+               IO: Stream the body, returning a file-like object that reads it incrementally.  The caller must
+                   close it.  Use this for large downloads that shouldn't be held in memory all at once.
                requests.Response: Return the HTTP response object.
                None: Return None.
             _base_url: Overrides self.endpoint, allowing alternative URL paths.
@@ -239,19 +336,25 @@ class ApiClient(ApiContainer):
         Raises:
             requests.HTTPError: If the API returns an error and on_error='raise'.
         """
-        import json, time, math
-        from urllib.parse import urljoin
-
         _data = validate(_data=_data).optional.dict(str, auto_create=True)
         if data:
-            _data = _data.copy()
-            _data.update(data)
+            if _data:
+                _data = {**_data, **data}  # Merge into a new dict so the caller's _data isn't mutated.
+            else:
+                _data = data  # The **data kwargs are already a new dict owned by this call, no copy is needed.
 
         _base_url = validate(_base_url=_base_url).optional.str()
-        _base_url: str = urljoin(self.endpoint, _base_url)
+        if _base_url is None:
+            _base_url = self.endpoint
+            base_prefix = self.__endpoint_prefix
+            hostname = self.__hostname
+        else:
+            _base_url: str = urljoin(self.endpoint, _base_url)
+            base_prefix = _base_url.rstrip("/") + "/"
+            hostname = urlparse(_base_url).hostname
 
         if self.dns_verify:
-            self._verify_hostname(_base_url)
+            self._verify_hostname(hostname)
 
         self._throttle_calls()
 
@@ -262,7 +365,7 @@ class ApiClient(ApiContainer):
         elif _endpoint_path.startswith("http"):
             raise ValueError(f"endpoint_path must be relative endpoint, not {_endpoint_path !r}.")
         
-        endpoint = _base_url.rstrip("/") + "/" + _endpoint_path.lstrip("/")
+        endpoint = base_prefix + _endpoint_path.lstrip("/")
         timeout = (self.connect_timeout, self.read_timeout)
         connection_errors = 0
 
@@ -271,18 +374,24 @@ class ApiClient(ApiContainer):
         attempts = 0     # Counter for debugging
 
         validate(_http_method=_http_method).required.as_one_of(str, HttpMethod)
+        expected = self._normalize_expected(_expected)
+        stream = _result_type is IO  # Defer reading the body so the caller can consume it incrementally.
+
         for attempt in range(self.max_retries):
             try:
                 if _http_method in ('GET', 'HEAD', 'OPTIONS'):
-                    params = {k: str(v).lower() if isinstance(v, bool) else v for k, v in _data.items()}
+                    if any(isinstance(v, bool) for v in _data.values()):
+                        # The APIs expect lowercase "true"/"false", whereas requests would send "True"/"False"
+                        params = {k: str(v).lower() if isinstance(v, bool) else v for k, v in _data.items()}
+                    else:
+                        params = _data
                     if self.trace:
                         print(f"{_http_method} {endpoint}: {params=}")
-                    response = self.session.request(_http_method, endpoint, params=params, timeout=timeout)
+                    response = self.session.request(_http_method, endpoint, params=params, timeout=timeout, stream=stream)
                 else:
-                    json_data = json.dumps(_data)
                     if self.trace:
-                        print(f"{_http_method} {endpoint}: data={json_data}")
-                    response = self.session.request(_http_method, endpoint, data=json_data, timeout=timeout)
+                        print(f"{_http_method} {endpoint}: data={json.dumps(_data)}")
+                    response = self.session.request(_http_method, endpoint, data=_json_dumps(_data), headers=_JSON_REQUEST_HEADERS, timeout=timeout, stream=stream)
 
                 if response.status_code == 500:
                     if "REQUEST_LIMIT_EXCEEDED" not in response.text:
@@ -301,8 +410,13 @@ class ApiClient(ApiContainer):
                 if connection_errors >= 2:
                     raise e
 
-            # Attempt 1=1s, 2=1s, 3=5s, 4=16s, 5=13s, etc...
+            if response is not None and attempt < self.max_retries - 1:
+                # Discarded in favor of the retry; a streamed body would otherwise hold its pooled connection until GC.
+                response.close()
+
+            # Attempt 1=1s, 2=1s, 3=5s, 4=16s, 5=13s, etc... with up to half of it randomized to avoid a thundering herd
             duration = math.ceil(attempt * attempt / 2)
+            duration = duration / 2 + random.uniform(0, duration / 2)
             if verbose:
                 print(f"Retrying after {duration}s, attempt {attempt+1} of {self.max_retries+1}: {_http_method} {endpoint}")
             time.sleep(duration)
@@ -310,13 +424,14 @@ class ApiClient(ApiContainer):
         if response is None:  # "None" should never happen
             raise Exception("Unexpected processing error; the final response was None")
         else:  # Always validate the final response
-            self._raise_for_status(response, _expected)
+            self._raise_for_status(response, expected)
 
         if attempts > 0 and verbose:
             print(f"Success after {attempts} reties")
 
         # TODO: Should we really return None on errors?  Kept for now for backwards compatibility.
         if not (200 <= response.status_code < 300):
+            response.close()  # Release the connection back to the pool, as a streamed body would otherwise hold it.
             return None
         if _result_type == requests.Response:
             return response
@@ -324,11 +439,15 @@ class ApiClient(ApiContainer):
             return response.text
         elif _result_type == bytes:
             return response.content
+        elif _result_type is IO:
+            response.raw.decode_content = True  # Transparently decompress gzip/deflate encoded bodies.
+            return response.raw
         elif _result_type is None:
             return None
         elif _result_type == dict:
             try:
-                return response.json()
+                # Parsed from the raw bytes; response.json() would first run charset detection over the whole body.
+                return _json_loads(response.content)
             except ValueError:
                 return {
                     "_status": response.status_code,
@@ -337,62 +456,75 @@ class ApiClient(ApiContainer):
         # TODO @doug.bateman: missing else clause
 
     @classmethod
-    def _verify_hostname(cls, test_url: str) -> None:
-        """Verify the host for the url-endpoint exists.  Throws socket.gaierror if it does not."""
-        import time
-        from urllib.parse import urlparse
-        from socket import gethostbyname, gaierror
-        from requests.exceptions import ConnectionError
+    def _verify_hostname(cls, hostname: str) -> None:
+        """
+        Verify the hostname exists.  Throws requests.exceptions.ConnectionError if it does not.
+        Each hostname is only looked up once; subsequent calls for a verified hostname return immediately.
+        """
+        hostname = validate(hostname=hostname).required.str()
 
-        test_url = validate(test_url=test_url).required.str()
+        if hostname in cls._verified_hostnames:
+            return
 
         if not cls.dns_retry:
-            test_url = urlparse(test_url)
             try:
-                gethostbyname(test_url.hostname)
+                gethostbyname(hostname)
             except gaierror as e:
-                raise ConnectionError(f"""DNS lookup for hostname failed for "{test_url.hostname}".""") from e
+                raise requests.exceptions.ConnectionError(f"""DNS lookup for hostname failed for "{hostname}".""") from e
         else:
             retries = 10
             last_exception = None
-            test_url = urlparse(test_url)
             for i in range(0, retries):
                 try:
-                    gethostbyname(test_url.hostname)
-                    return
+                    gethostbyname(hostname)
+                    break
                 except gaierror as e:
                     last_exception = e
                     time.sleep(i*2)
-            raise ConnectionError(f"""DNS lookup for hostname failed for "{test_url.hostname}" after {retries} retries.""") from last_exception
+            else:
+                raise requests.exceptions.ConnectionError(f"""DNS lookup for hostname failed for "{hostname}" after {retries} retries.""") from last_exception
+
+        cls._verified_hostnames.add(hostname)
 
     def _throttle_calls(self):
         if self.throttle_seconds <= 0:
             return
-        import time
-        now = time.time()
-        elapsed = now - self.__last_request_timestamp
-        sleep_seconds = self.throttle_seconds - elapsed
+        # Monotonic, so that wall-clock adjustments can't produce a negative or inflated elapsed time.
+        now = time.monotonic()
+        sleep_seconds = self.throttle_seconds - (now - self.__last_request_timestamp)
         if sleep_seconds > 0:
             time.sleep(sleep_seconds)
-        self.__last_request_timestamp = time.time()
+            now += sleep_seconds
+        self.__last_request_timestamp = now
 
     @staticmethod
-    def _raise_for_status(response: requests.Response, expected: Union[int, Container[int]] = None) -> None:
+    def _normalize_expected(expected: Union[str, HttpStatusCodes, None]) -> Container[int]:
+        """Converts the `_expected` parameter of api() into a container of status codes."""
+        if expected is None:
+            return ()
+        elif isinstance(expected, bool):
+            raise ValueError(f"The parameter was expected to be of type str, int, tuple, list or set, found {type(expected)}")
+        elif isinstance(expected, str):
+            return int(expected),
+        elif isinstance(expected, int):
+            return expected,
+        elif isinstance(expected, Container):
+            return expected
+        else:
+            raise ValueError(f"The parameter was expected to be of type str, int, tuple, list or set, found {type(expected)}")
+
+    @staticmethod
+    def _raise_for_status(response: requests.Response, expected: Container[int] = ()) -> None:
         """
         If response.status_code is `2xx` or in `expected`, do nothing.
         Raises :class:`DatabricksApiException` for 4xx Client Error, :class:`HTTPError`, for all other status codes.
+
+        Args:
+            response: The HTTP response to validate.
+            expected: Status codes already normalized by _normalize_expected()
         """
         if 200 <= response.status_code < 300:
             return
-        if expected is None:
-            expected = ()
-        elif type(expected) == str:
-            expected = (int(expected),)
-        elif type(expected) == int:
-            expected = (expected,)
-        elif not isinstance(expected, Container):
-            raise ValueError(
-                f"The parameter was expected to be of type str, int, tuple, list or set, found {type(expected)}")
         if response.status_code in expected:
             return
 
@@ -416,26 +548,33 @@ class ApiClient(ApiContainer):
             error_type = 'Unknown Error'
 
         try:
-            body = pformat(response.json(), indent=2)
+            parsed_body = _json_loads(response.content)
+            body = pformat(parsed_body, indent=2)
         except ValueError:
+            parsed_body = None
             body = response.text
 
         http_error_msg = f'{response.status_code} {error_type}: {reason} for url: {response.url}'
         http_error_msg += '\n Response from server: \n {}'.format(body)
         e = requests.HTTPError(http_error_msg, response=response)
         if 400 <= response.status_code < 500:
-            e = DatabricksApiException(http_exception=e)
+            # The body was already parsed for the message above, so it's handed over rather than parsed again.
+            e = DatabricksApiException(http_exception=e, parsed_body=parsed_body)
         raise e
 
 
 class DatabricksApiException(Exception):
-    def __init__(self, message=None, http_code=None, http_exception=None):
-        import json
+    def __init__(self, message=None, http_code=None, http_exception=None, parsed_body=None):
+        """
+        Args:
+            parsed_body: The JSON body of http_exception's response when the caller has already parsed it.
+                Defaults to None, in which case the response's body is parsed here.
+        """
         if http_exception:
             self.__cause__ = http_exception
             self.cause = http_exception
             try:
-                self.body = json.loads(http_exception.response.text)
+                self.body = parsed_body if parsed_body is not None else _json_loads(http_exception.response.content)
                 self.message = self.body.get("message", self.body.get("error", http_exception.response.text))
                 self.error_code = self.body.get("error_code", -1)
             except ValueError:
@@ -451,6 +590,7 @@ class DatabricksApiException(Exception):
             self.__cause__ = None
             self.cause = None
             self.body = message
+            self.message = message
             self.method = None
             self.endpoint = None
             self.http_code = http_code
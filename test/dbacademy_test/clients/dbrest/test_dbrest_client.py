@@ -1,5 +1,10 @@
+import io
+import inspect
 import unittest
+from unittest import mock
+from contextlib import redirect_stdout
 
+from dbacademy.clients.rest.common import ApiContainer
 from dbacademy.clients.rest.factory import dbrest_factory
 from dbacademy.clients import dbrest
 from dbacademy_test.clients.dbrest import DBACADEMY_UNIT_TESTS
@@ -33,6 +38,26 @@ class TestDBAcademyRestClient(unittest.TestCase):
         self.assertIsNotNone(client)
         self.assertEqual("https://curriculum-unit-tests.cloud.databricks.com", client.endpoint)
 
+    def test_help(self):
+        client = dbrest.from_args(endpoint="https://localhost", token="TOKEN")
+
+        # Replace every sub-API class so that building any one of them would be recorded.
+        sub_apis = {name: value for name, value in vars(dbrest).items()
+                    if inspect.isclass(value) and issubclass(value, ApiContainer) and value is not dbrest.DBAcademyRestClient}
+
+        output = io.StringIO()
+        with mock.patch.multiple(dbrest, **{name: mock.DEFAULT for name in sub_apis}) as mocks, redirect_stdout(output):
+            client.help()
+
+        for name, sub_api in mocks.items():
+            self.assertFalse(sub_api.called, f"help() built {name}")
+
+        member_names = output.getvalue().splitlines()
+        for member_name in ["clusters", "jobs", "scim", "workspace", "api()", "help()"]:
+            self.assertIn(member_name, member_names)
+        self.assertNotIn("client", member_names)
+        self.assertNotIn("endpoint", member_names)
+
     def testParentheses(self):
         ws: dbrest.DBAcademyRestClient = dbrest_factory.test_client()
         result = ws().workspace().ls("/")
@@ -1,9 +1,72 @@
 import unittest
+from unittest import mock
 from dbacademy.clients import docebo
+from dbacademy.clients.docebo import DoceboRestClient
 
 
 class TestDoceboRestClient(unittest.TestCase):
 
+    def setUp(self) -> None:
+        DoceboRestClient._token_cache.clear()
+
+    def tearDown(self) -> None:
+        DoceboRestClient._token_cache.clear()
+
+    @staticmethod
+    def token_response(access_token: str, expires_in: int) -> mock.Mock:
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"access_token": access_token, "expires_in": expires_in}
+        return response
+
+    @staticmethod
+    def authenticate(consumer_secret: str = "secret", password: str = "password", force: bool = False) -> str:
+        return DoceboRestClient.authenticate(endpoint="https://example.docebosaas.com",
+                                             consumer_key="key",
+                                             consumer_secret=consumer_secret,
+                                             username="user",
+                                             password=password,
+                                             force=force)
+
+    def test_authenticate_cache_hit(self):
+        with mock.patch.object(docebo, "_AUTH_SESSION") as session:
+            session.post.side_effect = [self.token_response("T1", 3600), self.token_response("T2", 3600)]
+
+            self.assertEqual("T1", self.authenticate())
+            self.assertEqual("T1", self.authenticate())
+            self.assertEqual(1, session.post.call_count)
+
+    def test_authenticate_refreshes_near_expiration(self):
+        with mock.patch.object(docebo, "_AUTH_SESSION") as session:
+            # Expiring within the 60-second window is treated as already expired.
+            session.post.side_effect = [self.token_response("T1", 30), self.token_response("T2", 3600)]
+
+            self.assertEqual("T1", self.authenticate())
+            self.assertEqual("T2", self.authenticate())
+            self.assertEqual(2, session.post.call_count)
+
+    def test_authenticate_different_credentials_miss(self):
+        with mock.patch.object(docebo, "_AUTH_SESSION") as session:
+            session.post.side_effect = [self.token_response("T1", 3600), self.token_response("T2", 3600), self.token_response("T3", 3600)]
+
+            self.assertEqual("T1", self.authenticate())
+            self.assertEqual("T2", self.authenticate(consumer_secret="other-secret"))
+            self.assertEqual("T3", self.authenticate(password="WRONG"))
+            self.assertEqual(3, session.post.call_count)
+
+        # Secrets are never held in the cache in plain text.
+        for cache_key in DoceboRestClient._token_cache:
+            self.assertNotIn("secret", cache_key)
+            self.assertNotIn("WRONG", cache_key)
+
+    def test_authenticate_force(self):
+        with mock.patch.object(docebo, "_AUTH_SESSION") as session:
+            session.post.side_effect = [self.token_response("T1", 3600), self.token_response("T2", 3600)]
+
+            self.assertEqual("T1", self.authenticate())
+            self.assertEqual("T2", self.authenticate(force=True))
+            self.assertEqual("T2", self.authenticate())
+            self.assertEqual(2, session.post.call_count)
+
     def test_create(self):
         client = docebo.from_environment()
         self.assertIsNotNone(client)
@@ -5,13 +5,31 @@
 
 # COMMAND ----------
 
+import io
+import gzip
+import urllib3
 import unittest
 import pytest
+import requests
+from typing import Dict
+from unittest import mock
 
 from dbacademy.clients.rest.common import ApiClient, DatabricksApiException
 from dbacademy.clients.rest.factory import dougrest_factory
 
 
+def build_response(status_code: int = 200, content: bytes = b"{}", headers: Dict[str, str] = None) -> requests.Response:
+    """Builds a response offline, as the HTTPAdapter would have returned it."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "Test"
+    response.url = "https://localhost/test"
+    response.headers.update(headers or dict())
+    response.raw = io.BytesIO(content)
+    response.request = requests.Request("GET", response.url).prepare()
+    return response
+
+
 class TestApiClient(unittest.TestCase):
     """
     Test client error handling, retry, and backoff features.
@@ -70,6 +88,119 @@ class TestApiClient(unittest.TestCase):
         except DatabricksApiException as e:
             self.assertIn(e.http_code, (401, 403))
 
+    def testChildClientSharesPoolNotHeaders(self):
+        parent = ApiClient("https://localhost", token="PARENT", pool_maxsize=8)
+        child = ApiClient("https://localhost", token="CHILD", client=parent, pool_maxsize=99)
+
+        self.assertIs(parent.http_adapter, child.http_adapter)
+        self.assertIs(parent.http_adapter, child.session.get_adapter("https://localhost"))
+        self.assertEqual(8, child.pool_maxsize)
+
+        child.session.headers["X-Child-Only"] = "true"
+        self.assertNotIn("X-Child-Only", parent.session.headers)
+
+        with mock.patch.object(parent.http_adapter, "send", return_value=build_response()) as send:
+            child.api("GET", "/api/2.0/test")
+            self.assertEqual("Bearer CHILD", send.call_args.args[0].headers["Authorization"])
+
+            parent.api("GET", "/api/2.0/test")
+            self.assertEqual("Bearer PARENT", send.call_args.args[0].headers["Authorization"])
+
+    def testEndpointPathLeadingSlashes(self):
+        client = ApiClient("https://localhost/api/", token="TOKEN")
+
+        with mock.patch.object(client.http_adapter, "send", return_value=build_response()) as send:
+            for path in ["2.0/test", "/2.0/test", "//2.0/test"]:
+                client.api("GET", path)
+                self.assertEqual("https://localhost/api/2.0/test", send.call_args.args[0].url)
+
+    def testNormalizeExpected(self):
+        self.assertEqual((), ApiClient._normalize_expected(None))
+        self.assertEqual((404,), ApiClient._normalize_expected("404"))
+        self.assertEqual((404,), ApiClient._normalize_expected(404))
+        self.assertEqual([200, 404], ApiClient._normalize_expected([200, 404]))
+        self.assertEqual({404}, ApiClient._normalize_expected({404}))
+
+        for invalid in [True, 404.0, object()]:
+            with self.assertRaises(ValueError, msg=f"Expected ValueError for {invalid!r}"):
+                ApiClient._normalize_expected(invalid)
+
+    def testRaiseForStatusJsonBody(self):
+        response = build_response(404, b'{"error_code": "RESOURCE_DOES_NOT_EXIST", "message": "Not here"}')
+        with self.assertRaises(DatabricksApiException) as context:
+            ApiClient._raise_for_status(response, ())
+
+        e = context.exception
+        self.assertEqual(404, e.http_code)
+        self.assertEqual("RESOURCE_DOES_NOT_EXIST", e.error_code)
+        self.assertEqual("Not here", e.message)
+        self.assertEqual({"error_code": "RESOURCE_DOES_NOT_EXIST", "message": "Not here"}, e.body)
+        self.assertEqual(("GET", "/test", 404, "RESOURCE_DOES_NOT_EXIST", "Not here"), e.args)
+
+        e.args = ("replaced",)
+        self.assertEqual(("replaced",), e.args)
+
+    def testRaiseForStatusTextBody(self):
+        response = build_response(400, b"Bad Request")
+        with self.assertRaises(DatabricksApiException) as context:
+            ApiClient._raise_for_status(response, ())
+
+        e = context.exception
+        self.assertEqual(400, e.http_code)
+        self.assertEqual(-1, e.error_code)
+        self.assertEqual("Bad Request", e.message)
+
+    def testRaiseForStatusExpected(self):
+        ApiClient._raise_for_status(build_response(404, b"Not Found"), (404,))
+
+        with self.assertRaises(requests.HTTPError):
+            ApiClient._raise_for_status(build_response(500, b"Server Error"), (404,))
+
+    def testStreamGzipEncodedBody(self):
+        from typing import IO
+
+        client = ApiClient("https://localhost", token="TOKEN")
+        response = build_response()
+        response.raw = urllib3.HTTPResponse(body=io.BytesIO(gzip.compress(b"streamed content")),
+                                            headers={"Content-Encoding": "gzip"},
+                                            status=200,
+                                            preload_content=False)
+
+        with mock.patch.object(client.http_adapter, "send", return_value=response) as send:
+            stream = client.api("GET", "/api/2.0/workspace/export", _result_type=IO)
+
+            self.assertTrue(send.call_args.kwargs["stream"])
+            self.assertEqual(b"streamed content", stream.read())
+            stream.close()
+
+    def testStreamClosesRetriedResponses(self):
+        from typing import IO
+
+        client = ApiClient("https://localhost", token="TOKEN")
+        rate_limited = build_response(429, b"Too Many Requests")
+        succeeded = build_response(200, b"content")
+
+        with mock.patch.object(client.http_adapter, "send", side_effect=[rate_limited, succeeded]), \
+                mock.patch.object(rate_limited, "close", wraps=rate_limited.close) as close, \
+                mock.patch("dbacademy.clients.rest.common.time.sleep"):
+            stream = client.api("GET", "/api/2.0/workspace/export", _result_type=IO)
+
+            close.assert_called_once()
+            self.assertEqual(b"content", stream.read())
+
+    def testVerifyHostnameCached(self):
+        hostname = "verify-hostname-cached.example.com"
+        try:
+            with mock.patch("dbacademy.clients.rest.common.gethostbyname", return_value="127.0.0.1") as gethostbyname:
+                ApiClient._verify_hostname(hostname)
+                self.assertIn(hostname, ApiClient._verified_hostnames)
+
+                # Verified hostnames return without another lookup.
+                ApiClient._verify_hostname(hostname)
+                gethostbyname.assert_called_once_with(hostname)
+        finally:
+            ApiClient._verified_hostnames.discard(hostname)
+
     @pytest.mark.skip(reason="This test is flaky and fails intermittently.")
     def testThrottle(self):
         print()